@@ -0,0 +1,261 @@
+import glob
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import numpy as np
+import pandas as pd
+
+from app.layout_manifest import MAGIC, DIRECTIONS, TABLES, FIELDS, MISSING, LayoutManifest
+
+# Column names used by the placement sheets, mapped to (table, key, size, location)
+SOURCE_COLUMNS = [
+    ('head', 'body', 'head_size', 'head_location'),
+    ('head', 'body_name', 'head_size', 'head_position'),
+    ('eyes', 'eye_name', 'eye_size', 'eye_location'),
+    ('mouth', 'imouth_name', 'mouth_size', 'mouth_location'),
+]
+
+# Folder under app/images/mouth holding each character's expression mouths
+MOUTH_EXPRESSION_DIRS = {
+    'character_1': 'kamal_mouth_expression',
+}
+
+# Where each sprite may live, relative to the images directory, tried in order
+SPRITE_PATTERNS = {
+    'head': ['eyes/{character}/body/{key}.png', 'body/{character}/*/{key}.png'],
+    'eyes': ['eyes/{character}/side_eyes/{key}/{key}_{direction}.png'],
+    'mouth': ['mouth/{character}/*/{key}.png', 'mouth/{expression_dir}/{key}.png'],
+}
+
+
+class LayoutManifestCompiler:
+    """
+    A class that compiles the per-character placement sheets into one binary layout manifest.
+
+    The sheets live in app/images/eyes/<character>/ and are named after the head direction
+    they describe, e.g. 'L body.xlsx', 'M eyes and mouth .xlsx' or 'L_body_cordinates.csv'.
+    Sizes and positions are stored there as "a,b" strings; the compiler parses them into
+    integers, checks that every referenced sprite exists and writes the tables read by
+    LayoutManifest.
+
+    Methods:
+    --------
+    __init__(images_dir: str = 'app/images'):
+        Initializes the compiler with the images directory.
+
+    collect_placements():
+        Reads every placement sheet and returns the parsed rows.
+
+    find_missing_sprites(placements):
+        Returns the placements whose sprite image does not exist.
+
+    source_digest():
+        Returns a SHA-256 digest of every placement sheet.
+
+    compile(output_file):
+        Validates the placements and writes the manifest.
+
+    check(manifest_file):
+        Returns True if the manifest was compiled from the current placement sheets.
+    """
+
+    def __init__(self, images_dir: str = 'app/images'):
+        self.images_dir = images_dir
+
+    @staticmethod
+    def parse_pair(value, source):
+        """
+        Parses an "a,b" string into two integers.
+
+        Parameters:
+        -----------
+        value : str
+            The cell value, e.g. "327,346".
+
+        source : str
+            Description of where the value came from, used in error messages.
+
+        Returns:
+        --------
+        tuple
+            The two integers.
+        """
+        match = re.fullmatch(r'\s*(-?\d+)\s*,\s*(-?\d+)\s*', str(value))
+        if match is None:
+            raise ValueError(f"Expected 'a,b' integers in {source}, got {value!r}")
+        return int(match.group(1)), int(match.group(2))
+
+    @staticmethod
+    def read_sheet(path):
+        """
+        Reads a placement sheet as strings, keeping values like '01' intact.
+        """
+        if path.endswith('.csv'):
+            return pd.read_csv(path, dtype=str)
+        return pd.read_excel(path, dtype=str)
+
+    def find_sheets(self):
+        """
+        Yields (character, direction, path) for every placement sheet in the images directory.
+        """
+        for character_dir in sorted(glob.glob(os.path.join(self.images_dir, 'eyes', 'character_*'))):
+            character = os.path.basename(character_dir)
+            paths = glob.glob(os.path.join(character_dir, '*.xlsx')) + glob.glob(os.path.join(character_dir, '*_cordinates.csv'))
+            for path in sorted(paths):
+                match = re.match(r'([LMR])[ _]', os.path.basename(path))
+                if match is None:
+                    raise ValueError(f"Cannot tell the head direction of {path}")
+                yield character, match.group(1), path
+
+    def collect_placements(self):
+        """
+        Reads every placement sheet and returns the parsed rows.
+
+        Rows without a size or location (placeholders for sprites not yet placed) are skipped.
+
+        Returns:
+        --------
+        dict
+            Maps (table, character, direction, key) to (width, height, x, y).
+        """
+        placements = {}
+        for character, direction, path in self.find_sheets():
+            df = self.read_sheet(path)
+            for table, key_col, size_col, location_col in SOURCE_COLUMNS:
+                if key_col not in df.columns:
+                    continue
+                for i, row in df[[key_col, size_col, location_col]].dropna().iterrows():
+                    source = f"{path} row {i + 2}"
+                    key = row[key_col].strip()
+                    placement = self.parse_pair(row[size_col], source) + self.parse_pair(row[location_col], source)
+
+                    index = (table, character, direction, key)
+                    if index in placements and placements[index] != placement:
+                        raise ValueError(f"Conflicting {table} layout for {character}/{direction}/{key} in {source}")
+                    placements[index] = placement
+        return placements
+
+    def find_missing_sprites(self, placements):
+        """
+        Returns the placements whose sprite image does not exist.
+
+        Parameters:
+        -----------
+        placements : dict
+            Placements as returned by collect_placements.
+
+        Returns:
+        --------
+        list
+            The sorted (table, character, direction, key) entries without a sprite.
+        """
+        missing = []
+        for table, character, direction, key in placements:
+            expression_dir = MOUTH_EXPRESSION_DIRS.get(character)
+            patterns = [pattern for pattern in SPRITE_PATTERNS[table]
+                        if expression_dir is not None or '{expression_dir}' not in pattern]
+            if table == 'head':
+                # The head itself has to exist as well as the body it sits on
+                if not os.path.exists(os.path.join(self.images_dir, 'head', character, f"{direction}.png")):
+                    missing.append((table, character, direction, key))
+                    continue
+            found = any(
+                glob.glob(os.path.join(self.images_dir, pattern.format(
+                    character=character, direction=direction, key=key, expression_dir=expression_dir)))
+                for pattern in patterns
+            )
+            if not found:
+                missing.append((table, character, direction, key))
+        return sorted(missing)
+
+    def source_digest(self):
+        """
+        Returns a SHA-256 digest of the names and contents of every placement sheet.
+        """
+        digest = hashlib.sha256()
+        for _, _, path in self.find_sheets():
+            digest.update(os.path.relpath(path, self.images_dir).replace(os.sep, '/').encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+        return digest.hexdigest()
+
+    def compile(self, output_file: str = 'app/data/layout_manifest.bin'):
+        """
+        Validates the placement sheets and writes the layout manifest.
+
+        Parameters:
+        -----------
+        output_file : str
+            Path where the manifest will be saved.
+        """
+        placements = self.collect_placements()
+        if not placements:
+            raise ValueError(f"No placement sheets found under {self.images_dir}")
+
+        missing = self.find_missing_sprites(placements)
+        if missing:
+            listing = '\n'.join('/'.join(entry) for entry in missing)
+            raise FileNotFoundError(f"Sprites referenced by the layout sheets do not exist:\n{listing}")
+
+        source_digest = self.source_digest()
+        characters = sorted({character for _, character, _, _ in placements})
+        keys = {table: sorted({key for t, _, _, key in placements if t == table}) for table in TABLES}
+
+        arrays = {}
+        for table in TABLES:
+            arrays[table] = np.full((len(characters), len(DIRECTIONS), len(keys[table]), len(FIELDS)), MISSING, dtype='<i4')
+        for (table, character, direction, key), placement in placements.items():
+            arrays[table][characters.index(character), DIRECTIONS.index(direction), keys[table].index(key)] = placement
+
+        # The header size depends on the offsets it records, so grow it until it is stable
+        header_length = 0
+        while True:
+            offset = len(MAGIC) + 4 + header_length
+            offset += -offset % 4
+            tables = {}
+            for table in TABLES:
+                tables[table] = {'keys': keys[table], 'shape': list(arrays[table].shape), 'offset': offset}
+                offset += arrays[table].nbytes
+            header = json.dumps({'characters': characters, 'directions': DIRECTIONS, 'fields': FIELDS, 'tables': tables,
+                                 'source_digest': source_digest}).encode('utf-8')
+            if len(header) == header_length:
+                break
+            header_length = len(header)
+
+        with open(output_file, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<I', len(header)))
+            f.write(header)
+            f.write(b'\0' * (-f.tell() % 4))
+            for table in TABLES:
+                f.write(arrays[table].tobytes())
+
+        print(f"Layout manifest with {len(placements)} placements saved to {output_file}")
+
+    def check(self, manifest_file: str = 'app/data/layout_manifest.bin'):
+        """
+        Returns True if the manifest was compiled from the current placement sheets.
+
+        Parameters:
+        -----------
+        manifest_file : str
+            Path to the compiled manifest.
+        """
+        if not os.path.exists(manifest_file):
+            print(f"{manifest_file} does not exist; run python -m app.compile_layout_manifest")
+            return False
+        manifest = LayoutManifest.load(manifest_file)
+        if manifest.source_digest != self.source_digest():
+            print(f"{manifest_file} is out of date with the placement sheets; run python -m app.compile_layout_manifest")
+            return False
+        print(f"{manifest_file} is up to date")
+        return True
+
+
+if __name__ == '__main__':
+    if '--check' in sys.argv[1:]:
+        raise SystemExit(0 if LayoutManifestCompiler().check() else 1)
+    LayoutManifestCompiler().compile()
@@ -1,7 +1,22 @@
+import csv
+import os
 import tkinter as tk
-from tkinter import filedialog
+from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 
+# Delay before a resize is rendered, so fast slider drags only render the last size
+RESIZE_DEBOUNCE_MS = 40
+
+# Longest side of the low-resolution copy of the overlay rendered while dragging the size slider
+PROXY_MAX_SIZE = 256
+
+# Name, size and position columns of each part in the layout files, the first of each is used for new files
+LAYOUT_COLUMNS = {
+    "head": (["body_name", "body"], ["head_size"], ["head_position", "head_location"]),
+    "eye": (["eye_name"], ["eye_size"], ["eye_location", "eye_position"]),
+    "mouth": (["imouth_name", "mouth_name"], ["mouth_size"], ["mouth_location", "mouth_position"]),
+}
+
 # Initialize the window
 root = tk.Tk()
 root.title("Streaming Platform Image Overlay")
@@ -11,6 +26,8 @@ x_offset = 0
 y_offset = 0
 scale_factor = 1
 flipped = False
+resize_job = None
+dragging_size = False
 
 # Frame for left-side controls (buttons, sliders, and size/position display)
 control_frame = tk.Frame(root)
@@ -32,19 +49,85 @@ height_label.pack(pady=5, fill=tk.X)
 x_label.pack(pady=5, fill=tk.X)
 y_label.pack(pady=5, fill=tk.X)
 
-# Copy x, y to clipboard
-def copy_xy_to_clipboard():
-    xy_position = f"{x_offset},{y_offset}"
-    root.clipboard_clear()
-    root.clipboard_append(xy_position)
-    root.update()  # Keeps the clipboard updated
-
-# Copy width, height to clipboard
-def copy_wh_to_clipboard():
-    wh_size = f"{int(overlay_img.width * scale_factor)},{int(overlay_img.height * scale_factor)}"
-    root.clipboard_clear()
-    root.clipboard_append(wh_size)
-    root.update()  # Keeps the clipboard updated
+# Name of the row written to the layout file (body, eye or mouth name), defaults to the overlay's file name
+layout_key = tk.StringVar()
+
+# Part placed by the overlay, which picks the columns written in the layout file
+layout_part = tk.StringVar(value="head")
+
+# Current size of the overlay on the canvas
+def overlay_size():
+    return int(overlay_img.width * scale_factor), int(overlay_img.height * scale_factor)
+
+# Index of the first of the given column names found in the header
+def find_column(header, names, file_path):
+    for name in names:
+        if name in header:
+            return header.index(name)
+    raise ValueError(f"{os.path.basename(file_path)} has no {' or '.join(names)} column.")
+
+# Guess the part an overlay places from where its image lives
+def guess_part(file_path):
+    folders = os.path.normpath(file_path).split(os.sep)
+    if "mouth" in folders:
+        return "mouth"
+    if "side_eyes" in folders or "side_eyes_blinking" in folders:
+        return "eye"
+    return "head"
+
+# Save the current size and position of a part into a layout coordinate file such as L_body_cordinates.csv
+def save_placement(file_path, key, part):
+    width, height = overlay_size()
+    size = f"{width},{height}"
+    position = f"{x_offset},{y_offset}"
+    name_cols, size_cols, position_cols = LAYOUT_COLUMNS[part]
+
+    # New or empty files only get the columns of this part
+    header = [name_cols[0], size_cols[0], position_cols[0]]
+    rows = []
+    if os.path.exists(file_path):
+        with open(file_path, newline="", encoding="utf-8") as f:
+            existing = list(csv.reader(f))
+        if existing:
+            header, *rows = existing
+
+    # Files such as "M eyes and mouth" hold several parts side by side, so only touch this part's columns
+    name_col = find_column(header, name_cols, file_path)
+    size_col = find_column(header, size_cols, file_path)
+    position_col = find_column(header, position_cols, file_path)
+
+    for row in rows:
+        if len(row) > name_col and row[name_col] == key:
+            row.extend([""] * (len(header) - len(row)))
+            row[size_col] = size
+            row[position_col] = position
+            break
+    else:
+        row = [""] * len(header)
+        row[name_col], row[size_col], row[position_col] = key, size, position
+        rows.append(row)
+
+    with open(file_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+# Ask for a layout file and save the current placement into it
+def export_placement():
+    if "overlay_img" not in globals():
+        return
+    key = layout_key.get().strip()
+    if not key:
+        messagebox.showerror("Missing name", "Enter the layout name to save this placement under.")
+        return
+    file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")], confirmoverwrite=False)
+    if file_path:
+        try:
+            save_placement(file_path, key, layout_part.get())
+        except ValueError as e:
+            messagebox.showerror("Unknown layout file", str(e))
+            return
+        status_label.config(text=f"Saved {key} to {os.path.basename(file_path)}")
 
 # Load background image function
 def load_background():
@@ -66,21 +149,44 @@ def load_background():
 
 # Load transparent image and overlay function
 def load_transparent_image():
-    global overlay_img, overlay_tk, overlay_canvas_id
+    global overlay_img, proxy_img, overlay_tk, overlay_canvas_id
     file_path = filedialog.askopenfilename()
     if file_path:
         overlay_img = Image.open(file_path).convert("RGBA")
+
+        # Eye images are named after the emotion and head direction, e.g. happy_M.png
+        name = os.path.splitext(os.path.basename(file_path))[0]
+        part = guess_part(file_path)
+        if part == "eye" and name[-2:] in ("_L", "_M", "_R"):
+            name = name[:-2]
+        layout_key.set(name)
+        layout_part.set(part)
+        if flipped:
+            overlay_img = overlay_img.transpose(Image.FLIP_LEFT_RIGHT)
+
+        # Low-resolution copy rendered while the size slider is being dragged
+        proxy_img = overlay_img.copy()
+        proxy_img.thumbnail((PROXY_MAX_SIZE, PROXY_MAX_SIZE))
         update_overlay()
 
-# Update image position, size, and the displayed values
-def update_overlay():
-    global overlay_tk, overlay_canvas_id, flipped
-    # Rescale the image
-    resized_img = overlay_img.resize((int(overlay_img.width * scale_factor), int(overlay_img.height * scale_factor)))
+# Update the displayed size and position values
+def update_labels():
+    width, height = overlay_size() if "overlay_img" in globals() else (0, 0)
+    width_label.config(text=f"Width: {width}")
+    height_label.config(text=f"Height: {height}")
+    x_label.config(text=f"X Position: {x_offset}")
+    y_label.config(text=f"Y Position: {y_offset}")
+
+# Re-render the overlay at its current size, from the proxy while dragging or at full quality otherwise
+def update_overlay(proxy=False):
+    global overlay_tk, overlay_canvas_id, resize_job
+    resize_job = None
 
-    # Flip the image if required
-    if flipped:
-        resized_img = resized_img.transpose(Image.FLIP_LEFT_RIGHT)
+    # Rescale the image
+    if proxy:
+        resized_img = proxy_img.resize(overlay_size(), Image.NEAREST)
+    else:
+        resized_img = overlay_img.resize(overlay_size(), Image.BICUBIC)
 
     overlay_tk = ImageTk.PhotoImage(resized_img)
 
@@ -91,11 +197,13 @@ def update_overlay():
     else:
         overlay_canvas_id = canvas.create_image(x_offset, y_offset, anchor=tk.NW, image=overlay_tk)
 
-    # Update the labels with the current size and position
-    width_label.config(text=f"Width: {int(overlay_img.width * scale_factor)}")
-    height_label.config(text=f"Height: {int(overlay_img.height * scale_factor)}")
-    x_label.config(text=f"X Position: {x_offset}")
-    y_label.config(text=f"Y Position: {y_offset}")
+    update_labels()
+
+# Move the existing canvas item without re-rendering the image
+def move_overlay():
+    if "overlay_canvas_id" in globals():
+        canvas.coords(overlay_canvas_id, x_offset, y_offset)
+    update_labels()
 
 # Remove overlay image function
 def remove_overlay_image():
@@ -106,25 +214,52 @@ def remove_overlay_image():
 
 # Slider functions
 def change_size(val):
-    global scale_factor
+    global scale_factor, resize_job
     scale_factor = float(val)
+    if "overlay_img" not in globals():
+        return
+    update_labels()
+
+    # Render once the slider pauses: the proxy while dragging, full quality otherwise. Tk may
+    # call this after the button release, so the job checks the drag state when it runs.
+    if resize_job is not None:
+        root.after_cancel(resize_job)
+    resize_job = root.after(RESIZE_DEBOUNCE_MS, render_resize)
+
+def render_resize():
+    update_overlay(proxy=dragging_size)
+
+def start_resize(event=None):
+    global dragging_size
+    dragging_size = True
+
+def finish_resize(event=None):
+    global dragging_size, resize_job
+    dragging_size = False
+    if "overlay_img" not in globals():
+        return
+    if resize_job is not None:
+        root.after_cancel(resize_job)
     update_overlay()
 
 def move_x(val):
     global x_offset
     x_offset = int(val)
-    update_overlay()
+    move_overlay()
 
 def move_y(val):
     global y_offset
     y_offset = int(val)
-    update_overlay()
+    move_overlay()
 
 # Function to flip image horizontally
 def flip_image():
-    global flipped
+    global flipped, overlay_img, proxy_img
     flipped = not flipped
-    update_overlay()
+    if "overlay_img" in globals():
+        overlay_img = overlay_img.transpose(Image.FLIP_LEFT_RIGHT)
+        proxy_img = proxy_img.transpose(Image.FLIP_LEFT_RIGHT)
+        update_overlay()
 
 # Buttons to load images
 btn_bg = tk.Button(control_frame, text="Open Background", command=load_background)
@@ -144,6 +279,8 @@ btn_remove_overlay.pack(pady=5, fill=tk.X)
 # Sliders for scaling and positioning in control frame
 size_slider = tk.Scale(control_frame, from_=0.1, to=2.0, resolution=0.01, orient=tk.HORIZONTAL, label="Resize", command=change_size)
 size_slider.pack(pady=5, fill=tk.X)
+size_slider.bind("<ButtonPress-1>", start_resize)
+size_slider.bind("<ButtonRelease-1>", finish_resize)
 
 x_slider = tk.Scale(control_frame, from_=-400, to=400, orient=tk.HORIZONTAL, label="Move Left/Right", command=move_x)
 x_slider.pack(pady=5, fill=tk.X)
@@ -151,12 +288,20 @@ x_slider.pack(pady=5, fill=tk.X)
 y_slider = tk.Scale(control_frame, from_=-400, to=400, orient=tk.HORIZONTAL, label="Move Up/Down", command=move_y)
 y_slider.pack(pady=5, fill=tk.X)
 
-# Buttons to copy x, y and width, height to clipboard
-btn_copy_xy = tk.Button(control_frame, text="Copy X,Y", command=copy_xy_to_clipboard)
-btn_copy_xy.pack(pady=5, fill=tk.X)
+# Part, name and button to save the placement into a layout coordinate file
+tk.Label(control_frame, text="Layout Part").pack(pady=(5, 0), fill=tk.X)
+part_menu = tk.OptionMenu(control_frame, layout_part, *LAYOUT_COLUMNS)
+part_menu.pack(pady=5, fill=tk.X)
+
+tk.Label(control_frame, text="Layout Name").pack(pady=(5, 0), fill=tk.X)
+key_entry = tk.Entry(control_frame, textvariable=layout_key)
+key_entry.pack(pady=5, fill=tk.X)
+
+btn_export = tk.Button(control_frame, text="Save to Layout File", command=export_placement)
+btn_export.pack(pady=5, fill=tk.X)
 
-btn_copy_wh = tk.Button(control_frame, text="Copy Width,Height", command=copy_wh_to_clipboard)
-btn_copy_wh.pack(pady=5, fill=tk.X)
+status_label = tk.Label(control_frame, text="")
+status_label.pack(pady=5, fill=tk.X)
 
 # Start the application
 root.mainloop()
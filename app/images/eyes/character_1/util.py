@@ -5,9 +5,9 @@ from matplotlib import pyplot as plt
 
 
 
-def overlay_eyes_on_head(head_img, eyes_img, eye_width_percent, eye_height_percent, x_offset, y_offset, flip_horizontal=False):
+def blend_eyes_on_head(head_img, eyes_img, eye_width_percent, eye_height_percent, x_offset, y_offset, flip_horizontal=False):
     """
-    Overlay an eyes image onto a head image at the specified location with given dimensions.
+    Blend an eyes image onto a head image in place at the specified location with given dimensions.
 
     Parameters:
     - head_img (np.array): Head image array.
@@ -17,6 +17,9 @@ def overlay_eyes_on_head(head_img, eyes_img, eye_width_percent, eye_height_perce
     - x_offset (int): X location on the head image where the eyes should be placed.
     - y_offset (int): Y location on the head image where the eyes should be placed.
     - flip_horizontal (bool): Whether to flip the eyes image horizontally (default is False).
+
+    Returns:
+    - np.array: The head image with the eyes blended in.
     """
     
     # Check if images are loaded correctly
@@ -65,6 +68,18 @@ def overlay_eyes_on_head(head_img, eyes_img, eye_width_percent, eye_height_perce
         head_img[y1:y2, x1:x2, c] = (alpha_channel * eyes_rgb[:, :, c] +
                                      alpha_background * head_img[y1:y2, x1:x2, c])
 
+    return head_img
+
+
+def overlay_eyes_on_head(head_img, eyes_img, eye_width_percent, eye_height_percent, x_offset, y_offset, flip_horizontal=False):
+    """
+    Overlay an eyes image onto a head image at the specified location with given dimensions
+    and display the result.
+
+    Takes the same parameters as blend_eyes_on_head.
+    """
+    head_img = blend_eyes_on_head(head_img, eyes_img, eye_width_percent, eye_height_percent, x_offset, y_offset, flip_horizontal)
+
     # Convert BGR image to RGB for displaying with Matplotlib
     head_img_rgb = cv2.cvtColor(head_img, cv2.COLOR_BGR2RGB)
 
@@ -0,0 +1,106 @@
+import json
+import struct
+import numpy as np
+
+# File layout: MAGIC, a little-endian uint32 header length, a UTF-8 JSON header,
+# padding to a 4-byte boundary, then the int32 tables described by the header.
+MAGIC = b'LAYOUT01'
+DIRECTIONS = ['L', 'M', 'R']
+TABLES = ['head', 'eyes', 'mouth']
+FIELDS = ['width', 'height', 'x', 'y']
+MISSING = np.iinfo(np.int32).min
+
+
+class LayoutManifest:
+    """
+    Read-only view of the compiled layout manifest produced by LayoutManifestCompiler.
+
+    Each table is an int32 array of shape (characters, directions, keys, 4) holding
+    width, height, x and y, indexed by character, head direction and key id. The key is
+    the body name for the head table, the emotion for the eyes table and the mouth shape
+    for the mouth table. Placements that were never authored hold MISSING. source_digest
+    identifies the placement sheets the manifest was compiled from.
+
+    The tables are memory-mapped, so loading is fast and render processes that open the
+    same manifest share its pages instead of each keeping a copy.
+
+    Methods:
+    --------
+    load(path):
+        Opens a compiled manifest file.
+
+    placement(table, character, direction, key):
+        Returns the (width, height, x, y) placement for one sprite.
+    """
+
+    def __init__(self, characters, keys, tables, source_digest=None):
+        self.characters = characters
+        self.source_digest = source_digest
+        self.directions = DIRECTIONS
+        self.keys = keys
+        self.tables = tables
+        self.character_ids = {name: i for i, name in enumerate(characters)}
+        self.direction_ids = {name: i for i, name in enumerate(DIRECTIONS)}
+        self.key_ids = {table: {name: i for i, name in enumerate(names)} for table, names in keys.items()}
+
+    @classmethod
+    def load(cls, path: str = 'app/data/layout_manifest.bin'):
+        """
+        Opens a compiled manifest file.
+
+        Parameters:
+        -----------
+        path : str
+            Path to the manifest written by LayoutManifestCompiler.
+
+        Returns:
+        --------
+        LayoutManifest
+            The manifest with its tables memory-mapped read-only.
+        """
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a layout manifest")
+            (header_length,) = struct.unpack('<I', f.read(4))
+            header = json.loads(f.read(header_length).decode('utf-8'))
+
+        tables = {}
+        for table in TABLES:
+            info = header['tables'][table]
+            tables[table] = np.memmap(path, dtype='<i4', mode='r', offset=info['offset'], shape=tuple(info['shape']))
+
+        keys = {table: header['tables'][table]['keys'] for table in TABLES}
+        return cls(header['characters'], keys, tables, header.get('source_digest'))
+
+    def placement(self, table: str, character: str, direction: str, key: str):
+        """
+        Returns the placement of one sprite.
+
+        Parameters:
+        -----------
+        table : str
+            One of 'head', 'eyes' or 'mouth'.
+
+        character : str
+            Character name, e.g. 'character_1'.
+
+        direction : str
+            Head direction, one of 'L', 'M' or 'R'.
+
+        key : str
+            Body name, emotion or mouth shape, depending on the table.
+
+        Returns:
+        --------
+        tuple
+            The (width, height, x, y) of the sprite.
+        """
+        try:
+            index = (self.character_ids[character], self.direction_ids[direction], self.key_ids[table][key])
+        except KeyError:
+            raise KeyError(f"No {table} layout for {character}/{direction}/{key}") from None
+
+        values = self.tables[table][index]
+        if values[0] == MISSING:
+            raise KeyError(f"No {table} layout for {character}/{direction}/{key}")
+        return tuple(int(v) for v in values)
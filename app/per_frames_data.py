@@ -1,9 +1,12 @@
 import pandas as pd
-from pydub import AudioSegment
 import numpy as np
 from g2p_en import G2p
 import math
 import hashlib
+from pydub import AudioSegment
+from pydub.exceptions import CouldntDecodeError
+
+from app.wav_reader import WavReader
 
 class FrameExploder:
     """
@@ -18,9 +21,16 @@ class FrameExploder:
     def get_audio_duration(self):
         """
         Returns the duration of the audio file in seconds.
+
+        Only the WAV header is read, so the cost does not grow with the length of the episode.
+        WAV files WavReader cannot parse (e.g. IEEE float) are decoded with AudioSegment.from_wav.
         """
-        audio = AudioSegment.from_wav(self.audio_file)
-        return len(audio) / 1000  # Convert milliseconds to seconds
+        try:
+            with WavReader(self.audio_file) as wav:
+                return wav.duration_ms() / 1000  # Convert milliseconds to seconds
+        except CouldntDecodeError:
+            audio = AudioSegment.from_wav(self.audio_file)
+            return len(audio) / 1000  # Convert milliseconds to seconds
 
     def load_csv(self):
         """
@@ -117,9 +127,16 @@ class FrameExploder:
         """
         Distributes frames evenly among phonemes and explodes rows accordingly.
         """
-        rows = []
+        return pd.DataFrame(list(self.iter_exploded_frames(df)))
+
+    def iter_exploded_frames(self, df):
+        """
+        Yields one dict per frame, distributing each row's frames evenly among its phonemes.
 
-        for idx, row in df.iterrows():
+        The middle phoneme takes any remainder. No frame is kept after it has been yielded, so
+        callers can consume the frames in batches without holding the whole episode in memory.
+        """
+        for _, row in df.iterrows():
             ini_frm = row['ini_frm']
             fin_frm = row['fin_frm']
             phonemes = row['mouth_phonems'].split(',')
@@ -136,16 +153,28 @@ class FrameExploder:
             if remainder > 0:
                 frames_list[middle_idx] += remainder
 
+            base_row = row.to_dict()
             frame_start = ini_frm
             for phoneme, frames in zip(phonemes, frames_list):
                 for _ in range(frames):
-                    new_row = row.copy()
+                    new_row = dict(base_row)
                     new_row['mouth_phonems'] = phoneme
                     new_row['frame'] = frame_start
-                    rows.append(new_row)
+                    yield new_row
                     frame_start += 1
 
-        return pd.DataFrame(rows)
+    def iter_frame_batches(self, df, chunksize=10000):
+        """
+        Groups the frames from iter_exploded_frames into DataFrames of at most chunksize rows.
+        """
+        batch = []
+        for frame in self.iter_exploded_frames(df):
+            batch.append(frame)
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch)
 
     def create_hash(self, row):
         """
@@ -154,12 +183,20 @@ class FrameExploder:
         combined_str = f"{row['character']}{row['head_direction']}{row['eye_direction']}{row['mouth_phonems']}{row['emotion']}{row['eye_blinking']}{row['body']}{row['mode']}{row['background']}"
         return hashlib.sha256(combined_str.encode()).hexdigest()
 
-    def generate_final_frames(self, df, output_file='final_frames.csv'):
+    def generate_final_frames(self, df, output_file='final_frames.csv', chunksize=10000):
         """
         Generates the final frame dataset, applies hashing, and saves it to a CSV.
+
+        Frames are exploded, hashed and appended to the output in batches of chunksize rows,
+        so peak memory stays flat regardless of the length of the episode.
         """
-        df_exploded = self.distribute_and_explode(df)
-        df_exploded['hash'] = df_exploded.apply(self.create_hash, axis=1)
-        df_exploded = df_exploded.drop(['ini_frm', 'fin_frm'], axis=1)
-        df_exploded.to_csv(output_file, index=False)
+        batches = 0
+        for df_batch in self.iter_frame_batches(df, chunksize=chunksize):
+            df_batch['hash'] = df_batch.apply(self.create_hash, axis=1)
+            df_batch = df_batch.drop(['ini_frm', 'fin_frm'], axis=1)
+            df_batch.to_csv(output_file, mode='w' if batches == 0 else 'a', header=(batches == 0), index=False)
+            batches += 1
+
+        if batches == 0:
+            raise ValueError(f"The timeline has no frames; {output_file} was not written")
 
@@ -0,0 +1,464 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import wave
+import numpy as np
+import pandas as pd
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+from app.create_csv_with_roman_words import HindiTransliterator
+from app.per_frames_data import FrameExploder
+from app.remove_silence import AudioProcessor
+
+# Values the synthetic timelines are drawn from
+SYNTHETIC_PHONEMES = ['AA1', 'AE2', 'AH0', 'B', 'CH', 'D', 'EH1', 'F', 'IY0', 'K', 'L', 'M', 'OW1', 'S', 'TH', 'UW1']
+SYNTHETIC_EMOTIONS = ['happy', 'sad', 'angry', 'worried']
+SYNTHETIC_DIRECTIONS = ['L', 'M', 'R']
+SYNTHETIC_FRAME_RATES = [8000, 11025, 16000, 22050, 44100, 48000]
+
+# Snapshot of create_csv_with_roman_words.hindi_to_latin, so edits to the live table are caught
+REFERENCE_HINDI_TO_LATIN = {
+    'अ': 'a', 'आ': 'aa', 'इ': 'i', 'ई': 'ee', 'उ': 'u', 'ऊ': 'oo', 'ऋ': 'ri',
+    'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au', 'ं': 'n', 'ः': 'h',
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': 'n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v', 'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+    'क्ष': 'ksh', 'त्र': 'tra', 'ज्ञ': 'gya',
+    'ा': 'a', 'ि': 'i', 'ी': 'ee', 'ु': 'u', 'ू': 'oo', 'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+    '्': '', 'ं': 'n', 'ँ': 'n', 'ः': 'h', 'ॉ': 'o',
+    '१': '1', '२': '2', '३': '3', '४': '4', '५': '5', '६': '6', '७': '7', '८': '8', '९': '9', '०': '0'
+}
+
+
+def reference_transliterate(text):
+    """
+    Reference copy of HindiTransliterator.transliterate_hindi.
+    """
+    transliterated = ""
+    for char in text:
+        transliterated += REFERENCE_HINDI_TO_LATIN.get(char, char)
+    return transliterated
+
+
+def reference_hash(row):
+    """
+    Reference copy of FrameExploder.create_hash.
+    """
+    combined_str = f"{row['character']}{row['head_direction']}{row['eye_direction']}{row['mouth_phonems']}{row['emotion']}{row['eye_blinking']}{row['body']}{row['mode']}{row['background']}"
+    return hashlib.sha256(combined_str.encode()).hexdigest()
+
+
+def reference_final_frames(df, output_file):
+    """
+    Reference copy of FrameExploder.distribute_and_explode followed by generate_final_frames,
+    building the whole exploded DataFrame in memory.
+    """
+    rows = []
+    for _, row in df.iterrows():
+        ini_frm = row['ini_frm']
+        fin_frm = row['fin_frm']
+        phonemes = row['mouth_phonems'].split(',')
+
+        total_frames = fin_frm - ini_frm + 1
+        num_phonemes = len(phonemes)
+
+        frames_list = [total_frames // num_phonemes] * num_phonemes
+        if total_frames % num_phonemes > 0:
+            frames_list[num_phonemes // 2] += total_frames % num_phonemes
+
+        frame_start = ini_frm
+        for phoneme, frames in zip(phonemes, frames_list):
+            for _ in range(frames):
+                new_row = row.copy()
+                new_row['mouth_phonems'] = phoneme
+                new_row['frame'] = frame_start
+                rows.append(new_row)
+                frame_start += 1
+
+    df_exploded = pd.DataFrame(rows)
+    df_exploded['hash'] = df_exploded.apply(reference_hash, axis=1)
+    df_exploded = df_exploded.drop(['ini_frm', 'fin_frm'], axis=1)
+    df_exploded.to_csv(output_file, index=False)
+
+
+def reference_silence(audio_file, csv_file, temp_dir, output_file):
+    """
+    Reference copy of AudioProcessor.split_audio and process_silence, loading the whole
+    audio file and keeping every chunk in memory.
+    """
+    df = pd.read_csv(csv_file)
+    audio = AudioSegment.from_wav(audio_file)
+    chunks = [audio[row['start'] * 1000:row['end'] * 1000] for _, row in df.iterrows()]
+
+    os.makedirs(temp_dir, exist_ok=True)
+    for i, chunk in enumerate(chunks):
+        chunk.export(os.path.join(temp_dir, f"{i + 1}.wav"), format="wav")
+
+    dfs = []
+    for i in range(len(chunks)):
+        sound = AudioSegment.from_file(os.path.join(temp_dir, f"{i + 1}.wav"), format="wav")
+        non_sil_times = detect_nonsilent(sound, min_silence_len=50, silence_thresh=sound.dBFS * 1.5)
+        if len(non_sil_times) > 0:
+            dfs.append(pd.DataFrame({'File_Name': [f"{i + 1}.wav"],
+                                     'Start_Silence': [non_sil_times[0][0] / 1000],
+                                     'End_Silence': [(len(sound) - non_sil_times[-1][1]) / 1000]}))
+    pd.concat(dfs, ignore_index=True).to_csv(output_file, index=False, encoding='utf-8')
+
+
+def reference_composite(head_img, eyes_img, eye_width_percent, eye_height_percent, x_offset, y_offset):
+    """
+    Reference copy of the blending done by overlay_eyes_on_head, without displaying the result.
+    """
+    import cv2
+
+    width = int(eyes_img.shape[1] * eye_width_percent / 100)
+    height = int(eyes_img.shape[0] * eye_height_percent / 100)
+    eyes_img = cv2.resize(eyes_img, (width, height))
+    y2 = min(y_offset + eyes_img.shape[0], head_img.shape[0])
+    x2 = min(x_offset + eyes_img.shape[1], head_img.shape[1])
+    eyes_img = eyes_img[:y2 - y_offset, :x2 - x_offset, :]
+
+    alpha_channel = eyes_img[:, :, 3] / 255.0
+    for c in range(0, 3):
+        head_img[y_offset:y2, x_offset:x2, c] = (alpha_channel * eyes_img[:, :, c] +
+                                                 (1.0 - alpha_channel) * head_img[y_offset:y2, x_offset:x2, c])
+    return head_img
+
+
+class RegressionHarness:
+    """
+    A class that checks the current implementations against reference copies of the original
+    code and reports how much faster each one is.
+
+    Every case runs the reference and the current implementation on the same input and
+    requires identical output: the same CSV bytes for frames, hashes and silence durations,
+    and composites within a pixel tolerance. Transliteration and hashing are also checked
+    against the shipped files in app/data. Frame generation and silence detection are
+    additionally checked on randomized synthetic timelines and WAV files.
+
+    Methods:
+    --------
+    __init__(audio_file: str = 'test1.wav', data_dir: str = 'app/data', images_dir: str = 'app/images', seeds: int = 50, audio_seeds: int = 10):
+        Initializes the harness with its inputs and the number of synthetic timelines and WAV files.
+
+    run():
+        Runs every case, prints a report and returns True if all of them passed.
+    """
+
+    def __init__(self, audio_file: str = 'test1.wav', data_dir: str = 'app/data', images_dir: str = 'app/images', seeds: int = 50, audio_seeds: int = 10):
+        self.audio_file = audio_file
+        self.data_dir = data_dir
+        self.images_dir = images_dir
+        self.seeds = seeds
+        self.audio_seeds = audio_seeds
+        self._exploder = None
+
+    @property
+    def exploder(self):
+        # G2p loads its model on construction, so only build the exploder once
+        if self._exploder is None:
+            self._exploder = FrameExploder(audio_file=self.audio_file, csv_file=os.path.join(self.data_dir, 'merged.csv'))
+        return self._exploder
+
+    @staticmethod
+    def timed(func, *args, **kwargs):
+        """
+        Calls func and returns its result with the elapsed wall-clock time in seconds.
+        """
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        return result, time.perf_counter() - start
+
+    @staticmethod
+    def same_file(path_a, path_b):
+        """
+        Returns True if the two files have the same bytes.
+        """
+        with open(path_a, 'rb') as a, open(path_b, 'rb') as b:
+            return a.read() == b.read()
+
+    def check_transliteration(self, temp_dir):
+        """
+        Transliterates the shipped result.json, every character of the reference table and
+        random strings of them, and compares the results with the reference. The shipped
+        words are also compared with the shipped original_timestamp_from_whisper.csv.
+        """
+        with open(os.path.join(self.data_dir, 'result.json'), 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        words = [word['text'] for segment in data.get('segments', []) for word in segment.get('words', [])]
+
+        # Random strings mix table characters with ones the table does not know
+        rng = random.Random(0)
+        alphabet = list(REFERENCE_HINDI_TO_LATIN) + ['a', 'Z', '9', ' ', '-', '\u0915\u093c', '\u0970']
+        texts = words + list(REFERENCE_HINDI_TO_LATIN)
+        texts += [''.join(rng.choices(alphabet, k=rng.randint(1, 12))) for _ in range(self.seeds * 20)]
+
+        expected, ref_time = self.timed(lambda: [reference_transliterate(text) for text in texts])
+        actual, new_time = self.timed(lambda: [HindiTransliterator.transliterate_hindi(text) for text in texts])
+        if actual != expected:
+            return False, ref_time, new_time, "transliterated words differ from the reference"
+
+        output_file = os.path.join(temp_dir, 'original_timestamp_from_whisper.csv')
+        HindiTransliterator().process_json_to_csv(os.path.join(self.data_dir, 'result.json'), output_file)
+        if not self.same_file(output_file, os.path.join(self.data_dir, 'original_timestamp_from_whisper.csv')):
+            return False, ref_time, new_time, "CSV differs from the shipped original_timestamp_from_whisper.csv"
+        return True, ref_time, new_time, f"{len(words)} shipped and {len(texts) - len(words)} generated words"
+
+    def check_shipped_hashes(self, temp_dir):
+        """
+        Re-hashes the shipped final_frames.csv and compares it with its hash column.
+        """
+        df = pd.read_csv(os.path.join(self.data_dir, 'final_frames.csv'), dtype=str, keep_default_na=False)
+
+        expected, ref_time = self.timed(df.apply, reference_hash, axis=1)
+        actual, new_time = self.timed(df.apply, self.exploder.create_hash, axis=1)
+        if not actual.equals(expected) or not actual.equals(df['hash']):
+            return False, ref_time, new_time, "hashes differ from the shipped final_frames.csv"
+        return True, ref_time, new_time, f"{len(df)} frames"
+
+    def compare_silence(self, audio_file, csv_file, temp_dir):
+        """
+        Splits audio_file and detects silence with the reference and the current AudioProcessor.
+        """
+        os.makedirs(temp_dir, exist_ok=True)
+        expected_file = os.path.join(temp_dir, 'silence_reference.csv')
+        actual_file = os.path.join(temp_dir, 'silence_actual.csv')
+        reference_dir = os.path.join(temp_dir, 'chunks_reference')
+
+        _, ref_time = self.timed(reference_silence, audio_file, csv_file, reference_dir, expected_file)
+
+        processor = AudioProcessor(audio_file=audio_file, csv_file=csv_file)
+        chunks_dir = os.path.join(temp_dir, 'chunks_actual')
+        _, new_time = self.timed(lambda: (processor.split_audio(chunks_dir), processor.process_silence(chunks_dir, actual_file)))
+
+        if sorted(os.listdir(reference_dir)) != sorted(os.listdir(chunks_dir)):
+            return False, ref_time, new_time, "different number of audio chunks"
+        for name in sorted(os.listdir(reference_dir)):
+            if not self.same_file(os.path.join(reference_dir, name), os.path.join(chunks_dir, name)):
+                return False, ref_time, new_time, f"audio chunk {name} differs"
+        if not self.same_file(actual_file, expected_file):
+            return False, ref_time, new_time, "silence durations differ"
+        return True, ref_time, new_time, f"{len(os.listdir(chunks_dir))} chunks"
+
+    @staticmethod
+    def synthetic_audio(seed, audio_file, csv_file):
+        """
+        Writes a random WAV file of quiet noise and tone bursts, and random word timestamps for it.
+
+        The sample rate, sample width and channel count are random, timestamps are rounded to
+        10 ms like Whisper's, and the last word ends past the end of the audio.
+        """
+        rng = random.Random(seed)
+        np_rng = np.random.default_rng(seed)
+        frame_rate = rng.choice(SYNTHETIC_FRAME_RATES)
+        sample_width = rng.choice([1, 2, 3, 4])
+        channels = rng.choice([1, 2])
+        duration = rng.uniform(2, 6)
+
+        n_frames = int(duration * frame_rate)
+        signal = np_rng.integers(-60, 60, n_frames).astype(np.int32)
+        t = np.arange(n_frames) / frame_rate
+        for _ in range(rng.randint(2, 8)):
+            start = rng.uniform(0, duration)
+            burst = (t >= start) & (t < start + rng.uniform(0.05, 0.6))
+            signal[burst] = (rng.randint(2000, 20000) * np.sin(2 * np.pi * rng.uniform(100, 900) * t[burst])).astype(np.int32)
+        signal = np.repeat(signal, channels)
+
+        # Scale the 16-bit signal to the chosen sample width; 8-bit WAV samples are unsigned
+        if sample_width == 1:
+            data = ((signal >> 8) + 128).astype(np.uint8).tobytes()
+        elif sample_width == 2:
+            data = signal.astype('<i2').tobytes()
+        elif sample_width == 3:
+            data = (signal << 8).astype('<i4').view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+        else:
+            data = (signal << 16).astype('<i4').tobytes()
+
+        with wave.open(audio_file, 'wb') as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(sample_width)
+            wav.setframerate(frame_rate)
+            wav.writeframes(data)
+
+        words = []
+        position = round(rng.uniform(0, 0.3), 2)
+        while position < duration:
+            end = round(position + rng.uniform(0.1, 0.8), 2)
+            words.append({'text': 'word', 'start': position, 'end': end})
+            position = round(end + rng.choice([0, 0, rng.uniform(0, 0.4)]), 2)
+        words[-1]['end'] = round(duration + rng.uniform(0.01, 0.5), 2)
+        pd.DataFrame(words).to_csv(csv_file, index=False)
+        return f"{frame_rate} Hz, {sample_width * 8}-bit, {channels} ch"
+
+    def check_silence(self, temp_dir):
+        """
+        Runs the silence comparison on test1.wav and on randomized synthetic WAV files.
+        """
+        csv_file = os.path.join(self.data_dir, 'original_timestamp_from_whisper.csv')
+        passed, ref_total, new_total, detail = self.compare_silence(self.audio_file, csv_file, os.path.join(temp_dir, 'test1'))
+        if not passed:
+            return False, ref_total, new_total, f"test1.wav: {detail}"
+
+        for seed in range(self.audio_seeds):
+            seed_dir = os.path.join(temp_dir, f"seed_{seed}")
+            os.makedirs(seed_dir)
+            audio_file = os.path.join(seed_dir, 'synthetic.wav')
+            words_file = os.path.join(seed_dir, 'words.csv')
+            audio_format = self.synthetic_audio(seed, audio_file, words_file)
+
+            passed, ref_time, new_time, detail = self.compare_silence(audio_file, words_file, seed_dir)
+            ref_total += ref_time
+            new_total += new_time
+            if not passed:
+                return False, ref_total, new_total, f"seed {seed} ({audio_format}): {detail}"
+        return True, ref_total, new_total, f"test1.wav and {self.audio_seeds} synthetic WAV files"
+
+    def check_frames(self, df, temp_dir, chunksize=10000):
+        """
+        Generates final frames for df with the reference and the current FrameExploder.
+        """
+        expected_file = os.path.join(temp_dir, 'frames_reference.csv')
+        actual_file = os.path.join(temp_dir, 'frames_actual.csv')
+
+        _, ref_time = self.timed(reference_final_frames, df.copy(), expected_file)
+        _, new_time = self.timed(self.exploder.generate_final_frames, df.copy(), output_file=actual_file, chunksize=chunksize)
+        return self.same_file(actual_file, expected_file), ref_time, new_time
+
+    def check_shipped_frames(self, temp_dir):
+        """
+        Runs the frame pipeline on the shipped merged.csv.
+        """
+        exploder = self.exploder
+        df = exploder.load_csv()
+        df = exploder.find_missing_timestamps(df)
+        df = exploder.add_phonemes(df)
+        df = exploder.adjust_frame_numbers(df)
+        df = exploder.add_initial_row(df)
+
+        same, ref_time, new_time = self.check_frames(df, temp_dir, chunksize=500)
+        return same, ref_time, new_time, f"{len(df)} rows" if same else "frames differ"
+
+    @staticmethod
+    def synthetic_timeline(seed):
+        """
+        Builds a random timeline shaped like the output of FrameExploder.add_initial_row.
+
+        Segments may be shorter than their phoneme count, which leaves some phonemes with no frames.
+        """
+        rng = random.Random(seed)
+        rows = []
+        frame = 1
+        for _ in range(rng.randint(1, 200)):
+            length = rng.randint(1, 30)
+            phonemes = [rng.choice(SYNTHETIC_PHONEMES) for _ in range(rng.randint(1, 8))]
+            rows.append({
+                'text': rng.choice(['', 'word']),
+                'character': f"character_{rng.randint(1, 3)}",
+                'head_direction': rng.choice(SYNTHETIC_DIRECTIONS),
+                'emotion': rng.choice(SYNTHETIC_EMOTIONS),
+                'eye_direction': rng.choice(SYNTHETIC_DIRECTIONS),
+                'eye_blinking': rng.random() < 0.1,
+                'mouth_phonems': ','.join(phonemes),
+                'body': f"{rng.randint(1, 7):02d}",
+                'mode': '1',
+                'background': 'Plain',
+                'hash': '',
+                'ini_frm': frame,
+                'fin_frm': frame + length - 1,
+            })
+            frame += length
+        return pd.DataFrame(rows)
+
+    def check_synthetic_frames(self, temp_dir):
+        """
+        Runs the frame comparison on randomized synthetic timelines with random batch sizes.
+        """
+        ref_total = new_total = 0
+        for seed in range(self.seeds):
+            chunksize = random.Random(seed).randint(1, 500)
+            same, ref_time, new_time = self.check_frames(self.synthetic_timeline(seed), temp_dir, chunksize=chunksize)
+            ref_total += ref_time
+            new_total += new_time
+            if not same:
+                return False, ref_total, new_total, f"frames differ for seed {seed} (chunksize {chunksize})"
+        return True, ref_total, new_total, f"{self.seeds} timelines"
+
+    def check_composite(self, temp_dir, tolerance=1):
+        """
+        Composites character_1's eyes onto its head with the reference blend and with
+        blend_eyes_on_head, placed using the compiled layout manifest. Only the blending is
+        timed; overlay_eyes_on_head also displays the result, which is not measured.
+        """
+        import cv2
+        from app.images.eyes.character_1.util import blend_eyes_on_head
+        from app.layout_manifest import LayoutManifest
+
+        manifest = LayoutManifest.load(os.path.join(self.data_dir, 'layout_manifest.bin'))
+        ref_total = new_total = 0
+        worst = 0
+        cases = 0
+        for direction in manifest.directions:
+            head_img = cv2.imread(os.path.join(self.images_dir, 'head', 'character_1', f"{direction}.png"))
+            for emotion in manifest.keys['eyes']:
+                try:
+                    width, height, x, y = manifest.placement('eyes', 'character_1', direction, emotion)
+                except KeyError:
+                    continue
+                eyes_path = os.path.join(self.images_dir, 'eyes', 'character_1', 'side_eyes', emotion, f"{emotion}_{direction}.png")
+                eyes_img = cv2.imread(eyes_path, cv2.IMREAD_UNCHANGED)
+
+                width_percent = width * 100 / eyes_img.shape[1]
+                height_percent = height * 100 / eyes_img.shape[0]
+
+                expected, ref_time = self.timed(reference_composite, head_img.copy(), eyes_img, width_percent, height_percent, x, y)
+                actual = head_img.copy()
+                _, new_time = self.timed(blend_eyes_on_head, actual, eyes_img, width_percent, height_percent, x, y)
+                ref_total += ref_time
+                new_total += new_time
+                cases += 1
+
+                diff = int(np.abs(actual.astype(int) - expected.astype(int)).max())
+                worst = max(worst, diff)
+                if diff > tolerance:
+                    return False, ref_total, new_total, f"{emotion}_{direction} differs by {diff} levels"
+        return True, ref_total, new_total, f"{cases} composites, max diff {worst}"
+
+    def run(self):
+        """
+        Runs every case, prints a report and returns True if all of them passed.
+        """
+        cases = [
+            ('transliteration', self.check_transliteration),
+            ('hashing (shipped final_frames.csv)', self.check_shipped_hashes),
+            ('silence detection', self.check_silence),
+            ('final frames (shipped merged.csv)', self.check_shipped_frames),
+            ('final frames (synthetic)', self.check_synthetic_frames),
+            ('compositing (character_1 eyes)', self.check_composite),
+        ]
+
+        all_passed = True
+        for name, check in cases:
+            temp_dir = tempfile.mkdtemp()
+            try:
+                passed, ref_time, new_time, detail = check(temp_dir)
+            except Exception as e:
+                passed, ref_time, new_time, detail = False, 0.0, 0.0, f"{type(e).__name__}: {e}"
+            finally:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+            all_passed = all_passed and passed
+            speedup = f"{ref_time / new_time:.2f}x" if new_time > 0 else "n/a"
+            print(f"{'PASS' if passed else 'FAIL'}  {name}: reference {ref_time:.3f}s, current {new_time:.3f}s, speedup {speedup} ({detail})")
+        return all_passed
+
+
+if __name__ == '__main__':
+    raise SystemExit(0 if RegressionHarness().run() else 1)
@@ -1,9 +1,12 @@
 import pandas as pd
 from pydub import AudioSegment
 import os
+from pydub.exceptions import CouldntDecodeError
 from pydub.silence import detect_nonsilent
 import shutil
 
+from app.wav_reader import WavReader
+
 class AudioProcessor:
     """
     A class to handle processing of audio files based on timestamps from a CSV.
@@ -14,35 +17,65 @@ class AudioProcessor:
         self.audio_file = audio_file
         self.csv_file = csv_file
 
-    def split_audio(self, output_dir: str = 'app/temp'):
+    def iter_audio_chunks(self, chunksize: int = 1000):
         """
-        Splits the audio file into chunks based on start and end times in the CSV file.
+        Yields the audio chunks described by the start and end times in the CSV file.
+
+        The CSV is read in windows of chunksize rows and each chunk is read directly from the
+        WAV file with WavReader, so only one chunk is held in memory at a time, however long
+        the audio is. The chunks are identical to slices of AudioSegment.from_wav. WAV files
+        WavReader cannot parse (e.g. IEEE float) are loaded whole with AudioSegment.from_wav.
 
         Parameters:
         -----------
-        output_dir : str
-            Directory where the audio chunks will be saved.
+        chunksize : int
+            Number of CSV rows read at a time.
+
+        Yields:
+        -------
+        AudioSegment
+            The audio between the start and end time of each row.
         """
-        # Step 1: Read the CSV file
-        df = pd.read_csv(self.csv_file)
+        try:
+            wav = WavReader(self.audio_file)
+            slice_audio = wav.slice
+        except CouldntDecodeError:
+            # Not PCM: let pydub decode the whole file with ffmpeg, as the previous code did
+            wav = None
+            audio = AudioSegment.from_wav(self.audio_file)
+            slice_audio = lambda start_time, end_time: audio[start_time:end_time]
+
+        try:
+            for df in pd.read_csv(self.csv_file, chunksize=chunksize):
+                for _, row in df.iterrows():
+                    start_time = row['start'] * 1000  # Convert to milliseconds
+                    end_time = row['end'] * 1000  # Convert to milliseconds
+                    yield slice_audio(start_time, end_time)
+        finally:
+            if wav is not None:
+                wav.close()
+
+    def split_audio(self, output_dir: str = 'app/temp', chunksize: int = 1000):
+        """
+        Splits the audio file into chunks based on start and end times in the CSV file.
 
-        # Step 2: Load the audio file
-        audio = AudioSegment.from_wav(self.audio_file)
+        Each chunk is exported as soon as it is read, so memory use does not depend on the
+        length of the audio.
 
-        # Step 3: Split the audio file into chunks
-        chunks = []
-        for _, row in df.iterrows():
-            start_time = row['start'] * 1000  # Convert to milliseconds
-            end_time = row['end'] * 1000  # Convert to milliseconds
-            chunk = audio[start_time:end_time]
-            chunks.append(chunk)
+        Parameters:
+        -----------
+        output_dir : str
+            Directory where the audio chunks will be saved.
 
-        # Step 4: Create output directory if it doesn't exist
+        chunksize : int
+            Number of CSV rows read at a time.
+        """
+        # Step 1: Create output directory if it doesn't exist
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
 
-        # Step 5: Export each chunk to a file
-        for i, chunk in enumerate(chunks):
+        # Step 2: Export each chunk to a file as it is read
+        for i, chunk in enumerate(self.iter_audio_chunks(chunksize=chunksize)):
             chunk.export(os.path.join(output_dir, f"{i + 1}.wav"), format="wav")
 
     @staticmethod
@@ -87,10 +120,12 @@ class AudioProcessor:
         output_file : str
             Path to save the CSV file with silence durations.
         """
-        dfs = []
         files = os.listdir(temp_dir)
         wav_files = sorted([f for f in files if f.endswith('.wav')], key=lambda x: int(os.path.splitext(x)[0]))
 
+        # Write the header first and append one row per chunk as it is processed
+        pd.DataFrame(columns=['File_Name', 'Start_Silence', 'End_Silence']).to_csv(output_file, index=False, encoding='utf-8')
+
         for filename in wav_files:
             file_path = os.path.join(temp_dir, filename)
             start_silence, end_silence = self.find_silence_durations(file_path)
@@ -98,11 +133,7 @@ class AudioProcessor:
                 df = pd.DataFrame({'File_Name': [os.path.basename(file_path)], 
                                    'Start_Silence': [start_silence], 
                                    'End_Silence': [end_silence]})
-                dfs.append(df)
-
-        # Concatenate all DataFrames into one and save to a CSV
-        df_final = pd.concat(dfs, ignore_index=True)
-        df_final.to_csv(output_file, index=False, encoding='utf-8')
+                df.to_csv(output_file, mode='a', header=False, index=False, encoding='utf-8')
 
     def merge_data(self, silence_csv: str = 'app/data/silence_duration.csv', output_file: str = 'app/data/merged.csv'):
         """
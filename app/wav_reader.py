@@ -0,0 +1,159 @@
+import os
+from pydub import AudioSegment
+from pydub.audio_segment import extract_wav_headers, read_wav_audio
+from pydub.exceptions import CouldntDecodeError, TooManyMissingFrames
+from pydub.utils import audioop
+
+
+class WavReader:
+    """
+    A class that reads windows of a WAV file without loading the whole file.
+
+    The header is parsed with pydub's own WAV parser, so PCM files (including
+    WAVE_FORMAT_EXTENSIBLE) can be read, and slice() returns exactly what slicing the fully
+    loaded AudioSegment would. Other encodings, such as IEEE float, raise CouldntDecodeError;
+    AudioSegment.from_wav decodes those with ffmpeg instead.
+
+    Methods:
+    --------
+    __init__(audio_file: str):
+        Opens the WAV file and reads its header.
+
+    duration_ms():
+        Returns the length of the audio in milliseconds, rounded like len(AudioSegment).
+
+    slice(start_time, end_time):
+        Returns the audio between two positions in milliseconds.
+
+    close():
+        Closes the file.
+    """
+
+    def __init__(self, audio_file: str):
+        self.file = open(audio_file, 'rb')
+        try:
+            self.read_header(audio_file)
+        except Exception:
+            self.file.close()
+            raise
+
+    def read_header(self, audio_file):
+        """
+        Parses the WAV header and finds the position and size of the audio data.
+        """
+        file_size = os.fstat(self.file.fileno()).st_size
+
+        # Read just enough of the file to reach the 'data' subchunk header
+        prefix_size = 4096
+        while True:
+            self.file.seek(0)
+            prefix = self.file.read(prefix_size)
+            headers = extract_wav_headers(prefix)
+            if (headers and headers[-1].id == b'data') or prefix_size >= file_size:
+                break
+            prefix_size *= 4
+
+        wav_data = read_wav_audio(prefix, headers)
+        data_header = headers[-1]
+
+        self.channels = wav_data.channels
+        self.frame_rate = wav_data.sample_rate
+        self.raw_sample_width = wav_data.bits_per_sample // 8
+        self.raw_frame_width = self.channels * self.raw_sample_width
+        if self.raw_frame_width == 0:
+            raise CouldntDecodeError(f"Invalid sample format in {audio_file}")
+
+        # Like read_wav_audio, trust the data size only as far as the file actually goes
+        self.data_offset = data_header.position + 8
+        data_size = min(data_header.size, file_size - self.data_offset)
+        self.n_frames = data_size // self.raw_frame_width
+
+        # 24-bit audio is widened to 32 bits by AudioSegment
+        self.sample_width = 4 if self.raw_sample_width == 3 else self.raw_sample_width
+        self.frame_width = self.channels * self.sample_width
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def frame_count(self, ms):
+        """
+        Converts milliseconds to a (fractional) frame count, like AudioSegment.frame_count.
+        """
+        return ms * (self.frame_rate / 1000.0)
+
+    def duration_ms(self):
+        """
+        Returns the length of the audio in milliseconds, rounded like len(AudioSegment).
+        """
+        return round(1000 * (self.n_frames / self.frame_rate))
+
+    def parse_position(self, ms):
+        """
+        Converts a position in milliseconds to a frame index, like AudioSegment._parse_position.
+        """
+        if ms < 0:
+            ms = self.duration_ms() - abs(ms)
+        return int(self.frame_count(ms))
+
+    def read_frames(self, start_frame, end_frame):
+        """
+        Returns the audio between two frame indices, clipped to the end of the file.
+        """
+        end_frame = max(min(end_frame, self.n_frames), start_frame)
+        self.file.seek(self.data_offset + start_frame * self.raw_frame_width)
+        data = self.file.read((end_frame - start_frame) * self.raw_frame_width)
+        if not data:
+            # AudioSegment cannot widen empty 24-bit data, so build the empty segment directly
+            return AudioSegment(data=b'', sample_width=self.sample_width,
+                                frame_rate=self.frame_rate, channels=self.channels)
+        if self.raw_sample_width == 1:
+            # convert from unsigned integers in wav
+            data = audioop.bias(data, 1, -128)
+        return AudioSegment(data=data, sample_width=self.raw_sample_width,
+                            frame_rate=self.frame_rate, channels=self.channels)
+
+    def slice(self, start_time, end_time):
+        """
+        Returns the audio between two positions in milliseconds.
+
+        Matches AudioSegment.from_wav(audio_file)[start_time:end_time] byte for byte: the
+        positions are clamped to the rounded length and up to 2 ms of silence is appended
+        when that length extends past the last frame.
+
+        Parameters:
+        -----------
+        start_time : float
+            Start of the slice in milliseconds.
+
+        end_time : float
+            End of the slice in milliseconds.
+
+        Returns:
+        --------
+        AudioSegment
+            The audio in the slice.
+        """
+        duration = self.duration_ms()
+        start_frame = self.parse_position(min(start_time, duration))
+        end_frame = self.parse_position(min(end_time, duration))
+
+        segment = self.read_frames(start_frame, end_frame)
+        data = segment.raw_data
+
+        # ensure the output is as long as AudioSegment slicing would make it
+        missing_frames = ((end_frame - start_frame) * self.frame_width - len(data)) // self.frame_width
+        if missing_frames > 0:
+            if missing_frames > self.frame_count(ms=2):
+                raise TooManyMissingFrames(
+                    "You should never be filling in "
+                    "   more than 2 ms with silence here, "
+                    "missing frames: %s" % missing_frames)
+            silence = audioop.mul(data[:self.frame_width], segment.sample_width, 0)
+            data += silence * missing_frames
+        return segment._spawn(data)
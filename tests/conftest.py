@@ -0,0 +1,27 @@
+import importlib.util
+import sys
+import types
+
+import pytest
+
+
+class FakeG2p:
+    """
+    Stands in for g2p_en.G2p, whose model is not needed to explode and hash frames.
+    """
+
+    def __call__(self, text):
+        return list(text)
+
+
+@pytest.fixture
+def frame_exploder(monkeypatch):
+    """
+    Returns FrameExploder with G2p replaced, so the test runs without the g2p_en model.
+    """
+    if importlib.util.find_spec("g2p_en") is None:
+        monkeypatch.setitem(sys.modules, "g2p_en", types.SimpleNamespace(G2p=FakeG2p))
+        monkeypatch.delitem(sys.modules, "app.per_frames_data", raising=False)
+    per_frames_data = importlib.import_module("app.per_frames_data")
+    monkeypatch.setattr(per_frames_data, "G2p", FakeG2p)
+    return per_frames_data.FrameExploder
@@ -0,0 +1,97 @@
+"""
+Round trip of the layout manifest: placement sheets compiled by LayoutManifestCompiler and read
+back with LayoutManifest, on a small images directory built in a temp folder.
+"""
+import pandas as pd
+import pytest
+
+from app.compile_layout_manifest import LayoutManifestCompiler
+from app.layout_manifest import LayoutManifest
+
+SPRITES = [
+    'head/character_1/L.png',
+    'head/character_1/M.png',
+    'eyes/character_1/body/01.png',
+    'eyes/character_1/body/02.png',
+    'eyes/character_1/side_eyes/happy/happy_M.png',
+    'mouth/character_1/set_1/AA.png',
+]
+
+
+def write_sheet(images_dir, name, rows):
+    path = images_dir / 'eyes' / 'character_1' / name
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def images_dir(tmp_path):
+    images_dir = tmp_path / 'images'
+    for sprite in SPRITES:
+        path = images_dir / sprite
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    write_sheet(images_dir, 'L_body_cordinates.csv', {
+        'body_name': ['01', '02'], 'head_size': ['327,346', '300,320'], 'head_position': ['10,-4', '12,0'],
+    })
+    write_sheet(images_dir, 'M_face_cordinates.csv', {
+        'eye_name': ['happy'], 'eye_size': ['90,40'], 'eye_location': ['120,150'],
+        'imouth_name': ['AA'], 'mouth_size': ['60,30'], 'mouth_location': ['135,220'],
+    })
+    return images_dir
+
+
+def test_round_trip(images_dir, tmp_path):
+    manifest_file = str(tmp_path / 'layout_manifest.bin')
+    LayoutManifestCompiler(str(images_dir)).compile(manifest_file)
+
+    manifest = LayoutManifest.load(manifest_file)
+
+    assert manifest.placement('head', 'character_1', 'L', '01') == (327, 346, 10, -4)
+    assert manifest.placement('head', 'character_1', 'L', '02') == (300, 320, 12, 0)
+    assert manifest.placement('eyes', 'character_1', 'M', 'happy') == (90, 40, 120, 150)
+    assert manifest.placement('mouth', 'character_1', 'M', 'AA') == (60, 30, 135, 220)
+    with pytest.raises(KeyError):
+        manifest.placement('head', 'character_1', 'M', '01')  # known key, never placed
+    with pytest.raises(KeyError):
+        manifest.placement('eyes', 'character_1', 'M', 'sad')  # unknown key
+
+
+def test_parse_pair_rejects_malformed_values():
+    assert LayoutManifestCompiler.parse_pair(' 12 , -3 ', 'cell') == (12, -3)
+    for value in ['12;3', '12', '1.5,2', 'a,b']:
+        with pytest.raises(ValueError):
+            LayoutManifestCompiler.parse_pair(value, 'cell')
+
+
+def test_conflicting_placements_are_rejected(images_dir, tmp_path):
+    write_sheet(images_dir, 'L_extra_cordinates.csv', {
+        'body_name': ['01'], 'head_size': ['1,1'], 'head_position': ['0,0'],
+    })
+
+    with pytest.raises(ValueError, match='Conflicting head layout'):
+        LayoutManifestCompiler(str(images_dir)).compile(str(tmp_path / 'layout_manifest.bin'))
+
+
+def test_missing_sprite_is_rejected(images_dir, tmp_path):
+    (images_dir / 'mouth' / 'character_1' / 'set_1' / 'AA.png').unlink()
+    manifest_file = tmp_path / 'layout_manifest.bin'
+
+    with pytest.raises(FileNotFoundError, match='mouth/character_1/M/AA'):
+        LayoutManifestCompiler(str(images_dir)).compile(str(manifest_file))
+    assert not manifest_file.exists()
+
+
+def test_check_detects_stale_manifest(images_dir, tmp_path):
+    manifest_file = str(tmp_path / 'layout_manifest.bin')
+    compiler = LayoutManifestCompiler(str(images_dir))
+
+    assert not compiler.check(manifest_file)  # not compiled yet
+    compiler.compile(manifest_file)
+    assert compiler.check(manifest_file)
+
+    write_sheet(images_dir, 'L_body_cordinates.csv', {
+        'body_name': ['01', '02'], 'head_size': ['327,346', '300,321'], 'head_position': ['10,-4', '12,0'],
+    })
+    assert not compiler.check(manifest_file)
@@ -0,0 +1,60 @@
+"""
+Edge cases of the streaming audio and frame paths.
+"""
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydub import AudioSegment
+from pydub.exceptions import CouldntDecodeError
+
+from app.remove_silence import AudioProcessor
+from app.wav_reader import WavReader
+
+FRAME_RATE = 8000
+
+
+def write_float_wav(path, samples):
+    """
+    Writes mono IEEE-float (format 0x3) samples, which pydub's own WAV parser rejects.
+    """
+    data = np.asarray(samples, dtype='<f4').tobytes()
+    fmt = struct.pack('<HHIIHH', 3, 1, FRAME_RATE, FRAME_RATE * 4, 4, 32)
+    with open(path, 'wb') as f:
+        f.write(b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + len(data)) + b'WAVE')
+        f.write(b'fmt ' + struct.pack('<I', len(fmt)) + fmt)
+        f.write(b'data' + struct.pack('<I', len(data)) + data)
+
+
+def test_float_wav_falls_back_to_from_wav(tmp_path, monkeypatch):
+    audio_file = str(tmp_path / "float.wav")
+    write_float_wav(audio_file, np.zeros(FRAME_RATE))
+    csv_file = str(tmp_path / "timestamps.csv")
+    pd.DataFrame({'text': ['a', 'b'], 'start': [0.0, 0.5], 'end': [0.25, 1.2]}).to_csv(csv_file, index=False)
+
+    with pytest.raises(CouldntDecodeError):
+        WavReader(audio_file)
+
+    # ffmpeg is what decodes these files in from_wav; stand in for it with the PCM equivalent
+    decoded = AudioSegment.silent(duration=1000, frame_rate=FRAME_RATE)
+    loaded = []
+    monkeypatch.setattr(AudioSegment, 'from_wav', lambda path: loaded.append(path) or decoded)
+
+    chunks = list(AudioProcessor(audio_file=audio_file, csv_file=csv_file).iter_audio_chunks())
+
+    assert loaded == [audio_file]
+    assert [chunk.raw_data for chunk in chunks] == [decoded[0:250].raw_data, decoded[500:1200].raw_data]
+
+
+def test_generate_final_frames_without_frames_raises(frame_exploder, tmp_path):
+    output_file = tmp_path / "final_frames.csv"
+    output_file.write_text("old,content\n")
+    df = pd.DataFrame({
+        'text': [''], 'character': ['character_1'], 'head_direction': ['M'], 'emotion': ['happy'],
+        'eye_direction': ['M'], 'eye_blinking': [False], 'mouth_phonems': ['M'], 'body': ['01'],
+        'mode': ['1'], 'background': ['Plain'], 'hash': [''], 'ini_frm': [5], 'fin_frm': [4],
+    })
+
+    with pytest.raises(ValueError):
+        frame_exploder(audio_file='', csv_file='').generate_final_frames(df, output_file=str(output_file))
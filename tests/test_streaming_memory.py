@@ -0,0 +1,106 @@
+"""
+Memory-ceiling tests for the streaming audio and frame paths on a synthetic 60-minute episode.
+
+Peak memory is measured with tracemalloc, which also sees numpy and pandas buffers. Each
+bound is far below what materializing the episode costs: the WAV alone is larger than the
+audio bound, and the exploded frames of the previous implementation took hundreds of MB.
+"""
+import os
+import tracemalloc
+import wave
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.remove_silence import AudioProcessor
+
+EPISODE_SECONDS = 60 * 60
+FRAME_RATE = 8000  # 16-bit mono, so the WAV is ~58 MB
+WORD_EVERY_SECONDS = 10
+WORD_SECONDS = 0.3
+
+AUDIO_PEAK_LIMIT = 16 * 1024 * 1024
+FRAMES_PEAK_LIMIT = 40 * 1024 * 1024
+
+
+def measure_peak(func, *args, **kwargs):
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(scope="module")
+def hour_wav(tmp_path_factory):
+    """
+    Writes a 60-minute WAV of quiet noise with a short tone at every word.
+    """
+    path = str(tmp_path_factory.mktemp("audio") / "episode.wav")
+    rng = np.random.default_rng(0)
+    t = np.arange(FRAME_RATE) / FRAME_RATE
+    tone = (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+    word_samples = int(WORD_SECONDS * FRAME_RATE)
+
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(FRAME_RATE)
+        for second in range(EPISODE_SECONDS):
+            block = rng.integers(-20, 20, FRAME_RATE, dtype=np.int16)
+            if second % WORD_EVERY_SECONDS == 0:
+                block[:word_samples] = tone[:word_samples]
+            wav.writeframes(block.tobytes())
+    return path
+
+
+@pytest.fixture(scope="module")
+def hour_timestamps(tmp_path_factory):
+    """
+    Writes word timestamps for the synthetic episode, one word every WORD_EVERY_SECONDS.
+    """
+    path = str(tmp_path_factory.mktemp("timestamps") / "timestamps.csv")
+    starts = np.arange(0, EPISODE_SECONDS, WORD_EVERY_SECONDS)
+    df = pd.DataFrame({"text": "word", "start": starts - 0.05, "end": starts + WORD_SECONDS + 0.05})
+    df["start"] = df["start"].clip(lower=0).round(2)
+    df["end"] = df["end"].round(2)
+    df.to_csv(path, index=False)
+    return path
+
+
+def test_split_audio_and_process_silence_memory(hour_wav, hour_timestamps, tmp_path):
+    processor = AudioProcessor(audio_file=hour_wav, csv_file=hour_timestamps)
+    temp_dir = str(tmp_path / "chunks")
+    silence_csv = str(tmp_path / "silence_duration.csv")
+
+    def run():
+        processor.split_audio(output_dir=temp_dir)
+        processor.process_silence(temp_dir=temp_dir, output_file=silence_csv)
+
+    peak = measure_peak(run)
+
+    assert os.path.getsize(hour_wav) > AUDIO_PEAK_LIMIT
+    assert peak < AUDIO_PEAK_LIMIT, f"peak {peak / 2**20:.1f} MB"
+    assert len(pd.read_csv(silence_csv)) == EPISODE_SECONDS // WORD_EVERY_SECONDS
+
+
+def test_generate_final_frames_memory(hour_wav, frame_exploder, tmp_path):
+    # One 12-frame word every half second at 24 fps
+    n = EPISODE_SECONDS * 2
+    df = pd.DataFrame({
+        'text': 'word', 'character': 'character_1', 'head_direction': 'M', 'emotion': 'happy',
+        'eye_direction': 'M', 'eye_blinking': False, 'mouth_phonems': 'AH0,B,K', 'body': '01',
+        'mode': '1', 'background': 'Plain', 'hash': '',
+        'ini_frm': np.arange(n) * 12, 'fin_frm': np.arange(n) * 12 + 11,
+    })
+    exploder = frame_exploder(audio_file=hour_wav, csv_file='')
+    output_file = str(tmp_path / "final_frames.csv")
+
+    peak = measure_peak(exploder.generate_final_frames, df, output_file=output_file)
+
+    assert peak < FRAMES_PEAK_LIMIT, f"peak {peak / 2**20:.1f} MB"
+    assert exploder.get_audio_duration() == EPISODE_SECONDS
+    with open(output_file) as f:
+        assert sum(1 for _ in f) == n * 12 + 1